@@ -0,0 +1,46 @@
+"""
+Benchmarks for the CSV serialization backends used by the test fixtures.
+
+The suite has moved between pandas, csv.DictWriter, and f-string rendering
+for payment CSVs; this keeps the choice data-driven and catches regressions.
+The directory sits outside pytest's default testpaths, so run it explicitly:
+
+    pytest benchmarks --benchmark-only --benchmark-compare-fail=mean:10%
+"""
+
+import csv
+import io
+
+import pandas as pd
+import pytest
+
+ROWS = [
+    {"customer_id": f"cust_{i:05d}", "payment_date": "2024-01-15", "amount": 1000.0 + i} for i in range(1000)
+]
+
+
+def _render_pandas(rows):
+    return pd.DataFrame(rows).to_csv(index=False)
+
+
+def _render_csv_module(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _render_fstring(rows):
+    lines = ["customer_id,payment_date,amount"]
+    lines.extend(f"{r['customer_id']},{r['payment_date']},{r['amount']}" for r in rows)
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {"pandas": _render_pandas, "csv": _render_csv_module, "fstring": _render_fstring}
+
+
+@pytest.mark.parametrize("impl", sorted(RENDERERS))
+def test_render_payments_csv(benchmark, impl):
+    result = benchmark(RENDERERS[impl], ROWS)
+    assert result.startswith("customer_id,payment_date,amount")
@@ -2,12 +2,37 @@
 Pytest configuration and fixtures for CVF tests
 """
 
+import logging
 import pytest
+import numpy as np
 import pandas as pd
+import structlog
 from typing import Dict, List, Any
 
 
-@pytest.fixture
+def pytest_addoption(parser):
+    parser.addoption(
+        "--test-verbose",
+        action="store_true",
+        default=False,
+        help="Emit INFO-level test logging instead of suppressing it",
+    )
+
+
+def pytest_configure(config):
+    # The test helpers log a structured INFO line per call, and structlog's
+    # processor chain formats and allocates for every one of them. A filtering
+    # bound logger at WARNING turns those calls into cheap no-ops; pass
+    # --test-verbose to get the INFO stream back when debugging.
+    level = logging.INFO if config.getoption("--test-verbose") else logging.WARNING
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+
+
+# Data fixtures are session-scoped: the calc functions treat their inputs as
+# read-only and pandas copy-on-write (always on under pandas 3) protects the
+# shared buffers, so each DataFrame is built once per run instead of per test.
+# Tests that need to mutate one must take an explicit .copy().
+@pytest.fixture(scope="session")
 def sample_payment_data() -> pd.DataFrame:
     """Sample payment data for testing"""
     return pd.DataFrame(
@@ -19,13 +44,13 @@ def sample_payment_data() -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_spend_data() -> pd.DataFrame:
     """Sample spend data for testing"""
     return pd.DataFrame({"cohort": ["2024-01-01", "2024-02-01"], "spend": [1000.0, 800.0]})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cohort_matrix() -> pd.DataFrame:
     """Sample cohort matrix for testing"""
     data = {
@@ -37,13 +62,24 @@ def sample_cohort_matrix() -> pd.DataFrame:
     return pd.DataFrame(data, index=index)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_predictions() -> Dict[str, Dict[str, float]]:
     """Sample prediction parameters for testing"""
     return {"2024-01-01": {"m0": 0.12, "churn": 0.25}, "2024-02-01": {"m0": 0.15, "churn": 0.20}}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_predictions_soa(sample_predictions):
+    """sample_predictions as aligned (index, m0, churn) arrays — the
+    structure-of-arrays form apply_predictions_to_cohort_df accepts without
+    walking a dict per cohort"""
+    index = pd.to_datetime(list(sample_predictions))
+    m0 = np.array([p["m0"] for p in sample_predictions.values()])
+    churn = np.array([p["churn"] for p in sample_predictions.values()])
+    return index, m0, churn
+
+
+@pytest.fixture(scope="session")
 def sample_thresholds() -> List[Dict[str, float]]:
     """Sample threshold rules for testing"""
     return [
@@ -53,7 +89,7 @@ def sample_thresholds() -> List[Dict[str, float]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_trades() -> List[Dict[str, Any]]:
     """Sample trade definitions for testing"""
     return [
@@ -62,13 +98,13 @@ def sample_trades() -> List[Dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_dataframe() -> pd.DataFrame:
     """Empty DataFrame for edge case testing"""
     return pd.DataFrame()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def single_customer_data() -> pd.DataFrame:
     """Single customer payment data for testing"""
     return pd.DataFrame(
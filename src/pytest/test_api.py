@@ -12,7 +12,6 @@ BASE_URL = "http://localhost:8000"
 
 
 @pytest.fixture(scope="module")
-@pytest.mark.api
 def company_id():
     """Fixture to provide a company ID for testing"""
     # First ensure we have a company to test with
@@ -16,6 +16,23 @@ from src.python.utils.calc import (
     calculate_current_month_owed,
 )
 
+# Parsed once at import; re-running pd.to_datetime on the same literal in
+# every test pays the dateutil parse and Timestamp allocation each time.
+JAN24 = pd.Timestamp("2024-01-01")
+FEB24 = pd.Timestamp("2024-02-01")
+MAR24 = pd.Timestamp("2024-03-01")
+
+
+def _mat(values: list, dates: list) -> pd.DataFrame:
+    """Build a small cohort matrix (one row per cohort) from a single 2-D
+    block and a prebuilt DatetimeIndex — no per-column dtype inference or
+    block consolidation like the dict-of-lists constructor."""
+    return pd.DataFrame(
+        np.asarray(values, dtype=np.float64),
+        index=pd.DatetimeIndex(np.array(dates, dtype="datetime64[ns]")),
+        columns=range(len(values[0])),
+    )
+
 
 @pytest.mark.unit
 class TestPaymentDfToCohortDf:
@@ -32,8 +49,8 @@ class TestPaymentDfToCohortDf:
         assert 1 in result.columns  # period 1 should exist
 
         # Check values - cust1 starts in Jan, cust2 starts in Jan, cust3 starts in Feb
-        jan_cohort = pd.to_datetime("2024-01-01")
-        feb_cohort = pd.to_datetime("2024-02-01")
+        jan_cohort = JAN24
+        feb_cohort = FEB24
 
         # Jan cohort should have cust1 + cust2 payments in period 0
         assert result.loc[jan_cohort, 0] == 250.0  # 100 + 150
@@ -89,10 +106,10 @@ class TestPaymentDfToCohortDf:
 class TestApplyPredictionsToCohortDf:
     """Tests for apply_predictions_to_cohort_df function"""
 
-    def test_basic_predictions(self, sample_cohort_matrix, sample_spend_data, sample_predictions):
+    def test_basic_predictions(self, sample_cohort_matrix, sample_spend_data, sample_predictions_soa):
         """Test basic prediction application"""
         result = apply_predictions_to_cohort_df(
-            predictions_dict=sample_predictions,
+            predictions_dict=sample_predictions_soa,
             spend_df=sample_spend_data,
             cohort_df=sample_cohort_matrix,
             horizon_months=6,
@@ -104,7 +121,7 @@ class TestApplyPredictionsToCohortDf:
         assert len(result) == 2  # 2 cohorts
 
         # Check that actual values are preserved
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         assert result.loc[jan_cohort, 0] == 100.0  # Original actual value
         assert result.loc[jan_cohort, 1] == 80.0  # Original actual value
 
@@ -117,20 +134,20 @@ class TestApplyPredictionsToCohortDf:
             predictions_dict=sample_predictions, spend_df=sample_spend_data, cohort_df=cohort_matrix, horizon_months=4
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Should apply m0 prediction: 0.12 * 1000 = 120
         assert result.loc[jan_cohort, 0] == 120.0
 
-    def test_decay_predictions(self, sample_cohort_matrix, sample_spend_data, sample_predictions):
+    def test_decay_predictions(self, sample_cohort_matrix, sample_spend_data, sample_predictions_soa):
         """Test geometric decay predictions"""
         result = apply_predictions_to_cohort_df(
-            predictions_dict=sample_predictions,
+            predictions_dict=sample_predictions_soa,
             spend_df=sample_spend_data,
             cohort_df=sample_cohort_matrix,
             horizon_months=6,
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Period 3 should be predicted using decay from period 2
         # 60.0 * (1 - 0.25)^1 = 60.0 * 0.75 = 45.0
         assert result.loc[jan_cohort, 3] == 45.0
@@ -147,7 +164,7 @@ class TestApplyPredictionsToCohortDf:
         )
 
         # Should return original data with extended columns filled with zeros
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         assert result.loc[jan_cohort, 0] == 100.0  # Original value
         assert result.loc[jan_cohort, 3] == 0.0  # No prediction
 
@@ -167,8 +184,8 @@ class TestApplyPredictionsToCohortDf:
         )
 
         # Only Jan cohort should get predictions (optimistic scenario)
-        jan_cohort = pd.to_datetime("2024-01-01")
-        feb_cohort = pd.to_datetime("2024-02-01")
+        jan_cohort = JAN24
+        feb_cohort = FEB24
 
         # Jan should have decay prediction
         assert result.loc[jan_cohort, 3] == 45.0  # 60 * 0.75
@@ -194,32 +211,26 @@ class TestApplyThresholdToCohortDf:
     def test_threshold_failure_detection(self, sample_spend_data, sample_thresholds):
         """Test specific threshold failure scenarios"""
         # Create cohort matrix with known failure
-        cohort_matrix = pd.DataFrame(
-            {0: [50.0], 1: [30.0]},  # 50/1000=5% < 10% (fail), 30/1000=3% < 8% (fail)
-            index=pd.to_datetime(["2024-01-01"]),
-        )
+        cohort_matrix = _mat([[50.0, 30.0]], ["2024-01-01"])  # 5% < 10% (fail), 3% < 8% (fail)
 
         result = apply_threshold_to_cohort_df(
             cohort_df=cohort_matrix, spend_df=sample_spend_data, thresholds=sample_thresholds
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         assert result.loc[jan_cohort, 0] == True  # Should fail (5% < 10%)
         assert result.loc[jan_cohort, 1] == True  # Should fail (3% < 8%)
 
     def test_threshold_pass(self, sample_spend_data, sample_thresholds):
         """Test threshold pass scenarios"""
         # Create cohort matrix that passes thresholds
-        cohort_matrix = pd.DataFrame(
-            {0: [150.0], 1: [100.0]},  # 150/1000=15% > 10% (pass), 100/1000=10% > 8% (pass)
-            index=pd.to_datetime(["2024-01-01"]),
-        )
+        cohort_matrix = _mat([[150.0, 100.0]], ["2024-01-01"])  # 15% > 10% (pass), 10% > 8% (pass)
 
         result = apply_threshold_to_cohort_df(
             cohort_df=cohort_matrix, spend_df=sample_spend_data, thresholds=sample_thresholds
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         assert result.loc[jan_cohort, 0] == False  # Should pass
         assert result.loc[jan_cohort, 1] == False  # Should pass
 
@@ -275,7 +286,7 @@ class TestGetCvfCashflowsDf:
         assert len(result) == 2  # 2 cohorts from trades
 
         # Check that collections are calculated
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Jan cohort: 100 * 0.5 = 50 (base sharing rate)
         assert result.loc[jan_cohort, 0] == 50.0
 
@@ -290,16 +301,14 @@ class TestGetCvfCashflowsDf:
             predicted_cohort_df=failing_matrix, spend_df=sample_spend_data, thresholds=thresholds, trades=sample_trades
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Should apply 100% sharing due to threshold failure: 50 * 1.0 = 50
         assert result.loc[jan_cohort, 0] == 50.0
 
     def test_cash_cap_limit(self, sample_spend_data, sample_thresholds):
         """Test cash cap limiting collections"""
         # Create high payment matrix
-        high_payment_matrix = pd.DataFrame(
-            {0: [1000.0], 1: [1000.0], 2: [1000.0]}, index=pd.to_datetime(["2024-01-01"])
-        )
+        high_payment_matrix = _mat([[1000.0, 1000.0, 1000.0]], ["2024-01-01"])
 
         # Low cash cap trade
         low_cap_trade = [
@@ -317,7 +326,7 @@ class TestGetCvfCashflowsDf:
             trades=low_cap_trade,
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Total collections should not exceed cap
         total_collections = result.loc[jan_cohort].sum()
         assert total_collections <= 100.0
@@ -340,7 +349,7 @@ class TestGetCvfCashflowsDf:
         )
 
         # Should handle gracefully and add empty row
-        mar_cohort = pd.to_datetime("2024-03-01")
+        mar_cohort = MAR24
         assert mar_cohort in result.index
         assert result.loc[mar_cohort].sum() == 0.0
 
@@ -358,7 +367,7 @@ class TestGetCvfCashflowsDf:
             trades=multiple_trades,
         )
 
-        jan_cohort = pd.to_datetime("2024-01-01")
+        jan_cohort = JAN24
         # Should sum both trades: 100*(0.3+0.2) = 50
         assert result.loc[jan_cohort, 0] == 50.0
 
@@ -431,9 +440,7 @@ class TestCalculateCurrentMonthOwed:
 
     def test_basic_current_month_calculation(self):
         """Test basic current month owed calculation"""
-        cashflows_df = pd.DataFrame(
-            {0: [50.0, 40.0], 1: [30.0, 25.0], 2: [20.0, 15.0]}, index=pd.to_datetime(["2024-01-01", "2024-02-01"])
-        )
+        cashflows_df = _mat([[50.0, 30.0, 20.0], [40.0, 25.0, 15.0]], ["2024-01-01", "2024-02-01"])
 
         result = calculate_current_month_owed(cashflows_df=cashflows_df, as_of_month=date(2024, 3, 1))
 
@@ -457,7 +464,7 @@ class TestCalculateCurrentMonthOwed:
         assert result == 300.0  # 100 + 200
 
 
-@pytest.mark.unit
+@pytest.mark.integration
 class TestIntegrationScenarios:
     """Integration tests combining multiple functions"""
 
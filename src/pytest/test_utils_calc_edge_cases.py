@@ -127,6 +127,9 @@ class TestEdgeCases:
         jan_cohort = pd.to_datetime("2024-01-01")
         # By period 5, should be nearly zero
         assert result.loc[jan_cohort, 5] < 1.0
+        # And the whole row should decay monotonically
+        row = result.loc[jan_cohort].to_numpy()
+        assert np.all(np.diff(row) <= 0)
 
     def test_zero_churn_rate(self):
         """Test predictions with zero churn (no decay)"""
@@ -143,8 +146,8 @@ class TestEdgeCases:
 
         jan_cohort = pd.to_datetime("2024-01-01")
         # All periods should have same value (no decay)
-        for period in range(1, 6):
-            assert result.loc[jan_cohort, period] == 100.0
+        row = result.loc[jan_cohort, 1:5].to_numpy()
+        assert np.allclose(row, 100.0)
 
     def test_extreme_cash_caps(self):
         """Test cashflows with extreme cash caps"""
@@ -228,19 +231,16 @@ class TestPerformanceConsiderations:
         n_customers = 10000
         n_payments_per_customer = 12
 
-        customers = []
-        dates = []
-        amounts = []
-
-        base_date = pd.Timestamp("2024-01-01")
-
-        for i in range(n_customers):
-            for j in range(n_payments_per_customer):
-                customers.append(f"cust{i}")
-                # Spread payments over 12 months
-                payment_date = base_date + pd.DateOffset(months=j)
-                dates.append(payment_date)
-                amounts.append(100.0)
+        # Broadcast constructors instead of a 120k-iteration append loop, so
+        # fixture construction doesn't dominate what the test measures
+        customer_ids = np.repeat(np.arange(n_customers), n_payments_per_customer)
+        customers = np.char.add("cust", customer_ids.astype(str))
+        # Spread each customer's payments over 12 months
+        dates = np.tile(
+            pd.date_range("2024-01-01", periods=n_payments_per_customer, freq="MS"),
+            n_customers,
+        )
+        amounts = np.full(n_customers * n_payments_per_customer, 100.0)
 
         large_df = pd.DataFrame({"customer_id": customers, "payment_date": dates, "amount": amounts})
 
@@ -2,11 +2,11 @@
 Test script for CSV processor functionality
 """
 
+import functools
 import pytest
+import csv
 import io
-import asyncio
 from fastapi import UploadFile
-import pandas as pd
 import structlog
 from src.python.utils.csv_processor import PaymentsCSVProcessor, get_payments_csv_processor
 
@@ -15,114 +15,78 @@ logger = structlog.get_logger(__file__)
 
 def create_test_csv_content(data: list) -> str:
     """Create CSV content from list of dictionaries"""
-    df = pd.DataFrame(data)
-    return df.to_csv(index=False)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(data[0].keys()))
+    writer.writeheader()
+    writer.writerows(data)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_upload_bytes(content: str) -> bytes:
+    """Encode fixture content once per distinct string across the module"""
+    return content.encode("utf-8")
 
 
 def create_mock_upload_file(filename: str, content: str) -> UploadFile:
     """Create a mock UploadFile for testing"""
-    file_like = io.BytesIO(content.encode("utf-8"))
+    file_like = io.BytesIO(_build_upload_bytes(content))
     return UploadFile(filename=filename, file=file_like)
 
 
-@pytest.mark.unit
-async def test_valid_payments_csv():
-    """Test processing a valid payments CSV"""
-    logger.info("Testing valid payments CSV processing")
-
-    # Create test data
-    test_data = [
+# Static fixture payloads, rendered once at module load
+VALID_PAYMENTS_CSV = create_test_csv_content(
+    [
         {"customer_id": "cust_001", "payment_date": "2024-01-15", "amount": 1000.50},
         {"customer_id": "cust_002", "payment_date": "2024-01-20", "amount": 750.25},
         {"customer_id": "cust_001", "payment_date": "2024-02-15", "amount": 900.00},
     ]
-
-    csv_content = create_test_csv_content(test_data)
-    upload_file = create_mock_upload_file("test_payments.csv", csv_content)
-
-    # Create processor
-    processor = PaymentsCSVProcessor()
-
-    try:
-        # Test CSV reading
-        df = await processor.read_csv_content(upload_file)
-        logger.info("CSV read successfully", shape=df.shape, columns=list(df.columns))
-
-        # Test column validation
-        processor.validate_required_columns(df, processor.REQUIRED_COLUMNS)
-        logger.info("Column validation passed")
-
-        # Test data type validation
-        validated_df = processor.validate_data_types(df, processor.COLUMN_TYPES)
-        logger.info("Data type validation passed", dtypes=validated_df.dtypes.to_dict())
-
-        return True
-
-    except Exception as e:
-        logger.error("Test failed", error=str(e))
-        return False
-
-
-@pytest.mark.unit
-async def test_invalid_csv_format():
-    """Test handling of invalid CSV format"""
-    logger.info("Testing invalid CSV format handling")
-
-    # Create invalid content
-    invalid_content = "This is not a CSV file content"
-    upload_file = create_mock_upload_file("invalid.csv", invalid_content)
-
-    processor = PaymentsCSVProcessor()
-
-    try:
-        df = await processor.read_csv_content(upload_file)
-        logger.error("Should have failed but didn't")
-        return False
-    except Exception as e:
-        logger.info("Correctly caught invalid format", error=str(e))
-        return True
-
-
-@pytest.mark.unit
-async def test_missing_columns():
-    """Test handling of missing required columns"""
-    logger.info("Testing missing columns handling")
-
-    # Create CSV with missing columns
-    test_data = [
+)
+MISSING_COLUMNS_CSV = create_test_csv_content(
+    [
         {"customer_id": "cust_001", "amount": 1000.50},  # Missing payment_date
         {"customer_id": "cust_002", "amount": 750.25},
     ]
+)
 
-    csv_content = create_test_csv_content(test_data)
-    upload_file = create_mock_upload_file("missing_cols.csv", csv_content)
-
-    processor = PaymentsCSVProcessor()
 
-    try:
-        df = await processor.read_csv_content(upload_file)
-        processor.validate_required_columns(df, processor.REQUIRED_COLUMNS)
-        logger.error("Should have failed but didn't")
-        return False
-    except Exception as e:
-        logger.info("Correctly caught missing columns", error=str(e))
-        return True
+@pytest.fixture(scope="module")
+def processor() -> PaymentsCSVProcessor:
+    """One processor shared across the module; it holds no per-test state"""
+    return PaymentsCSVProcessor()
 
 
 @pytest.mark.unit
-def test_non_csv_file():
-    """Test handling of non-CSV file extensions"""
-    logger.info("Testing non-CSV file handling")
-
-    upload_file = create_mock_upload_file("document.txt", "some content")
-    processor = PaymentsCSVProcessor()
-
-    try:
+@pytest.mark.parametrize(
+    "filename,content,should_pass",
+    [
+        pytest.param("test_payments.csv", VALID_PAYMENTS_CSV, True, id="valid-payments"),
+        # pandas parses arbitrary text as a header-only frame, so this is
+        # rejected at column validation rather than at read time
+        pytest.param("invalid.csv", "This is not a CSV file content", False, id="invalid-format"),
+        pytest.param("missing_cols.csv", MISSING_COLUMNS_CSV, False, id="missing-columns"),
+        pytest.param("document.txt", "some content", False, id="non-csv-extension"),
+    ],
+)
+async def test_csv_validation(processor: PaymentsCSVProcessor, filename: str, content: str, should_pass: bool):
+    """Run the full validation pipeline against valid and invalid uploads"""
+    logger.info("Testing CSV validation", filename=filename, should_pass=should_pass)
+
+    upload_file = create_mock_upload_file(filename, content)
+
+    if should_pass:
         processor.validate_csv_file(upload_file)
-        logger.error("Should have failed but didn't")
-        assert False
-    except Exception as e:
-        logger.info("Correctly rejected non-CSV file", error=str(e))
+        df = await processor.read_csv_content(upload_file)
+        processor.validate_required_columns(df, processor.REQUIRED_COLUMNS)
+        validated_df = processor.validate_data_types(df, processor.COLUMN_TYPES)
+        assert len(validated_df) == len(df)
+    else:
+        # The first pipeline stage that rejects the upload exits the block
+        with pytest.raises(Exception):
+            processor.validate_csv_file(upload_file)
+            df = await processor.read_csv_content(upload_file)
+            processor.validate_required_columns(df, processor.REQUIRED_COLUMNS)
+            processor.validate_data_types(df, processor.COLUMN_TYPES)
 
 
 @pytest.mark.unit
@@ -134,46 +98,3 @@ async def test_factory_function():
     assert isinstance(processor, PaymentsCSVProcessor)
 
 
-async def main():
-    """Run all tests"""
-    logger.info("Starting CSV Processor Test Suite")
-
-    tests = [
-        ("Valid CSV Processing", test_valid_payments_csv()),
-        ("Invalid CSV Format", test_invalid_csv_format()),
-        ("Missing Columns", test_missing_columns()),
-        ("Non-CSV File", test_non_csv_file()),
-        ("Factory Function", test_factory_function()),
-    ]
-
-    results = []
-    for test_name, test_coro in tests:
-        logger.info("Running test", test_name=test_name)
-        try:
-            if asyncio.iscoroutine(test_coro):
-                result = await test_coro
-            else:
-                result = test_coro
-            results.append((test_name, result))
-            status = "✅ PASSED" if result else "❌ FAILED"
-            logger.info("Test completed", test_name=test_name, status=status)
-        except Exception as e:
-            logger.error("Test error", test_name=test_name, error=str(e))
-            results.append((test_name, False))
-
-    # Summary
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
-
-    logger.info("Test suite completed", passed=passed, total=total, success_rate=f"{passed / total * 100:.1f}%")
-
-    if passed == total:
-        logger.info("All tests passed! 🎉")
-    else:
-        logger.warning("Some tests failed", failed=total - passed)
-
-    return passed == total
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
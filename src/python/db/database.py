@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import os
 import structlog
@@ -12,15 +12,48 @@ logger = structlog.get_logger(__file__)
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./cvf.db")
 
-# SQLAlchemy engine
+# SQLAlchemy engine. Pool sizing covers concurrent FastAPI requests without
+# per-request connect cost; the enlarged statement cache keeps the repetitive
+# per-company queries compiled across requests.
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=3600,
+    query_cache_size=1200,
+    insertmanyvalues_page_size=10_000,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
 )
 
+if DATABASE_URL.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a writer holds the log, which
+        # matters once API reads and CSV uploads overlap. The remaining
+        # pragmas trade a little durability (NORMAL still survives app
+        # crashes) for far fewer fsyncs, and move page cache / temp tables /
+        # reads into memory-mapped territory.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only profile for analytics paths: expire_on_commit=False keeps loaded
+# rows usable after the transaction without re-fetch, and since these paths
+# never write there is nothing for autoflush or expiry bookkeeping to protect.
+# Both factories share the one engine, so pooling stays unified.
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
 
 # Dependency to get database session
 def get_db():
@@ -31,6 +64,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency for endpoints that only read"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # Create tables
 def create_tables():
     """Create all database tables"""
@@ -3,19 +3,46 @@ Database operations layer for CVF API
 Abstracts all database interactions from the main API endpoints
 """
 
+import io
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import date
+from sqlalchemy import and_, exists, func, insert, literal, select, union_all
+from sqlalchemy.engine import Result
+from datetime import date, datetime
+import numpy as np
 import pandas as pd
 import structlog
 from fastapi import Depends
 
 from src.python.db.schemas import Company, Trade, Payment, Threshold, Spend, Customer
-from src.python.db.database import get_db
+from src.python.db.database import get_db, get_read_db
 
 logger = structlog.get_logger(__file__)
 
+# Rows per executemany batch for bulk inserts; bounds per-statement memory
+# without giving up the single surrounding transaction
+BULK_INSERT_BATCH_SIZE = 5000
+
+# Assembled analytics payloads keyed by company id. Each entry stores the
+# version stamp it was built from (per-table MAX(id)/COUNT(*) pairs), so
+# inserts and deletes are picked up on the next fetch without any explicit
+# bookkeeping. In-place updates do not move the stamp, so the update
+# operations below drop the entry directly. The cached DataFrames are shared
+# across requests; the calc pipeline treats its inputs as read-only.
+_analytics_data_cache: Dict[int, tuple] = {}
+
+
+def _invalidate_analytics_cache(company_id: int) -> None:
+    """Drop the cached analytics payload after a write the version stamp can't see"""
+    _analytics_data_cache.pop(company_id, None)
+
+
+# Company ids confirmed to exist. Nearly every endpoint starts with a
+# company_exists check; the API has no company deletion, so a positive
+# answer never goes stale and can be memoized for the process lifetime.
+# Negative answers are never cached — the company may be created later.
+_known_company_ids: set = set()
+
 
 class CompanyOperations:
     """Database operations for Company model"""
@@ -23,18 +50,40 @@ class CompanyOperations:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_company(self, name: str) -> Company:
-        """Create a new company"""
+    def create_company(self, name: str, commit: bool = True) -> Company:
+        """Create a new company.
+
+        Callers creating several records should pass commit=False and issue
+        one commit at the end; flush still populates the primary key.
+        """
         logger.info("Creating company", name=name)
 
         company = Company(name=name)
         self.db.add(company)
-        self.db.commit()
-        self.db.refresh(company)
+        if commit:
+            self.db.commit()
+            self.db.refresh(company)
+        else:
+            self.db.flush()
 
+        _known_company_ids.add(company.id)
         logger.info("Company created", company_id=company.id, name=name)
         return company
 
+    def create_companies(self, names: List[str]) -> List[Company]:
+        """Create several companies in one transaction"""
+        logger.info("Creating companies", count=len(names))
+
+        companies = [Company(name=name) for name in names]
+        self.db.add_all(companies)
+        self.db.commit()
+        for company in companies:
+            self.db.refresh(company)
+            _known_company_ids.add(company.id)
+
+        logger.info("Companies created", count=len(companies))
+        return companies
+
     def get_company_by_id(self, company_id: int) -> Optional[Company]:
         """Get company by ID"""
         logger.debug("Fetching company", company_id=company_id)
@@ -51,8 +100,15 @@ class CompanyOperations:
         return self.db.query(Company).all()
 
     def company_exists(self, company_id: int) -> bool:
-        """Check if company exists"""
-        return self.db.query(Company).filter(Company.id == company_id).first() is not None
+        """Check if company exists via an EXISTS subquery, returning a single
+        boolean instead of hydrating a full row. Positive results are memoized
+        process-wide since companies are never deleted."""
+        if company_id in _known_company_ids:
+            return True
+        found = self.db.query(exists().where(Company.id == company_id)).scalar()
+        if found:
+            _known_company_ids.add(company_id)
+        return bool(found)
 
 
 class TradeOperations:
@@ -67,6 +123,7 @@ class TradeOperations:
         cohort_month: date,
         sharing_percentage: float = 0.5,
         cash_cap: float = 0.0,
+        commit: bool = True,
     ) -> Trade:
         """Create a new trade with trading terms"""
         logger.info(
@@ -84,8 +141,11 @@ class TradeOperations:
             cash_cap=cash_cap,
         )
         self.db.add(trade)
-        self.db.commit()
-        self.db.refresh(trade)
+        if commit:
+            self.db.commit()
+            self.db.refresh(trade)
+        else:
+            self.db.flush()
 
         logger.info("Trade created", trade_id=trade.id)
         return trade
@@ -138,20 +198,108 @@ class PaymentOperations:
         return payment
 
     def bulk_create_payments(self, payments: List[Payment]) -> int:
-        """Bulk create payment records"""
+        """Bulk create payment records.
+
+        Strips the instances down to plain column dicts and reuses the Core
+        executemany path, so the insert skips the per-instance unit-of-work
+        flush and identity-map population that add_all would pay.
+        """
         logger.info("Bulk creating payments", payment_count=len(payments))
 
-        self.db.add_all(payments)
+        rows = [
+            {
+                "company_id": payment.company_id,
+                "customer_id": payment.customer_id,
+                "payment_date": payment.payment_date,
+                "cohort_month": payment.cohort_month,
+                "amount": payment.amount,
+            }
+            for payment in payments
+        ]
+        self.bulk_insert_payment_rows(rows)
         self.db.commit()
 
         logger.info("Payments created successfully", count=len(payments))
         return len(payments)
 
+    def bulk_insert_payment_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert payment rows in a single Core executemany statement.
+
+        Takes plain column dicts rather than ORM instances so the insert skips
+        unit-of-work bookkeeping entirely. Does not commit; callers own the
+        transaction boundary.
+        """
+        if not rows:
+            return 0
+
+        logger.info("Bulk inserting payment rows", row_count=len(rows))
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            self._copy_payment_rows(rows)
+        else:
+            for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                self.db.execute(insert(Payment), rows[start : start + BULK_INSERT_BATCH_SIZE])
+
+        return len(rows)
+
+    def _copy_payment_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """COPY-based fast path for PostgreSQL backends.
+
+        COPY bypasses per-statement parsing and type checks, so it beats even
+        batched INSERTs on large uploads. Python-side column defaults do not
+        apply here, so created_at is filled in explicitly.
+        """
+        columns = ("company_id", "customer_id", "payment_date", "cohort_month", "amount", "created_at")
+        created_at = datetime.utcnow()
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                f"{row['company_id']}\t{row['customer_id']}\t{row['payment_date']}\t"
+                f"{row['cohort_month']}\t{row['amount']}\t{created_at}\n"
+            )
+        buffer.seek(0)
+
+        raw_connection = self.db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_from(buffer, "payments", columns=columns)
+
     def list_payments_by_company(self, company_id: int) -> List[Payment]:
         """List all payments for a company"""
         logger.debug("Listing payments", company_id=company_id)
         return self.db.query(Payment).filter(Payment.company_id == company_id).all()
 
+    def iter_payments_by_company(self, company_id: int, chunk: int = 10_000):
+        """Stream Payment instances in fixed-size batches.
+
+        Sequential-scan alternative to list_payments_by_company: yield_per
+        keeps at most one batch of hydrated objects in the identity map at a
+        time, bounding peak memory for companies with millions of payments.
+        Consumers that only aggregate columns should prefer iter_payment_rows,
+        which skips ORM hydration entirely.
+        """
+        logger.debug("Streaming payments", company_id=company_id, chunk=chunk)
+        return (
+            self.db.query(Payment)
+            .filter(Payment.company_id == company_id)
+            .execution_options(stream_results=True)
+            .yield_per(chunk)
+        )
+
+    def iter_payment_rows(self, company_id: int, yield_per: int = 10_000) -> Result:
+        """Stream payment rows for cashflow computation.
+
+        Selects only the columns the calculation reads and streams them in
+        batches via yield_per, so large companies never materialize a full
+        list of hydrated Payment instances just to aggregate four fields.
+        """
+        logger.debug("Streaming payment rows", company_id=company_id)
+        return self.db.execute(
+            select(Payment.customer_id, Payment.payment_date, Payment.cohort_month, Payment.amount)
+            .where(Payment.company_id == company_id)
+            .execution_options(yield_per=yield_per)
+        )
+
     def get_customer_payments(self, company_id: int, customer_id: str) -> List[Payment]:
         """Get all payments for a specific customer"""
         return (
@@ -160,6 +308,21 @@ class PaymentOperations:
             .all()
         )
 
+    def get_first_payment_dates(self, company_id: int) -> Dict[str, date]:
+        """Map each customer to their earliest payment date.
+
+        One grouped aggregate query replaces a per-customer lookup loop, so
+        cohort assignment pays a single round trip regardless of upload size.
+        """
+        logger.debug("Fetching first payment dates", company_id=company_id)
+        rows = (
+            self.db.query(Payment.customer_id, func.min(Payment.payment_date))
+            .filter(Payment.company_id == company_id)
+            .group_by(Payment.customer_id)
+            .all()
+        )
+        return {customer_id: first_date for customer_id, first_date in rows}
+
     def get_payment_by_id(self, payment_id: int) -> Optional[Payment]:
         """Get payment by ID"""
         logger.debug("Fetching payment", payment_id=payment_id)
@@ -192,6 +355,7 @@ class PaymentOperations:
 
         self.db.commit()
         self.db.refresh(payment)
+        _invalidate_analytics_cache(payment.company_id)
 
         logger.info("Payment updated", payment_id=payment_id)
         return payment
@@ -211,29 +375,73 @@ class PaymentOperations:
         logger.info("Payment deleted", payment_id=payment_id)
         return True
 
+    def get_cohort_matrix_dataframe(self, company_id: int) -> pd.DataFrame:
+        """Cohort matrix (cohort month x period) aggregated in the database.
+
+        SUM(amount) GROUP BY (cohort_month, payment_month) runs server-side,
+        so one row per matrix cell crosses the wire instead of one per
+        payment; Python only computes period offsets and reshapes the
+        already-aggregated cells.
+        """
+        logger.debug("Aggregating cohort matrix in database", company_id=company_id)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            payment_month = func.date_trunc("month", Payment.payment_date)
+        else:
+            payment_month = func.strftime("%Y-%m-01", Payment.payment_date)
+
+        rows = self.db.execute(
+            select(Payment.cohort_month, payment_month.label("payment_month"), func.sum(Payment.amount))
+            .where(Payment.company_id == company_id)
+            .group_by(Payment.cohort_month, payment_month)
+        ).all()
+
+        if not rows:
+            logger.warning("No payments found", company_id=company_id)
+            return pd.DataFrame(index=pd.DatetimeIndex([]), dtype=float)
+
+        cells = pd.DataFrame.from_records(rows, columns=["cohort", "payment_month", "amount"])
+        cohort = pd.to_datetime(cells["cohort"])
+        month = pd.to_datetime(cells["payment_month"])
+        period = (month.dt.year - cohort.dt.year) * 12 + (month.dt.month - cohort.dt.month)
+        return (
+            pd.DataFrame({"cohort": cohort, "period": period, "amount": cells["amount"].astype(float)})
+            .pivot(index="cohort", columns="period", values="amount")
+            .fillna(0.0)
+            .sort_index()
+        )
+
     def get_payments_dataframe(self, company_id: int) -> pd.DataFrame:
-        """Get payments as pandas DataFrame for calculations"""
+        """Get payments as pandas DataFrame for calculations.
+
+        Selects bare column tuples instead of hydrating Payment instances and
+        hands them to from_records in one shot — no identity-map entries and
+        no per-row dict building between the driver and the DataFrame.
+        """
         logger.debug("Converting payments to DataFrame", company_id=company_id)
 
-        payments = self.list_payments_by_company(company_id)
+        columns = ["customer_id", "payment_date", "amount", "cohort_month"]
+        rows = self.db.execute(
+            select(Payment.customer_id, Payment.payment_date, Payment.amount, Payment.cohort_month).where(
+                Payment.company_id == company_id
+            )
+        ).all()
 
-        if not payments:
+        if not rows:
             logger.warning("No payments found", company_id=company_id)
             return pd.DataFrame()
 
-        data = []
-        for payment in payments:
-            data.append(
-                {
-                    "customer_id": payment.customer_id,
-                    "payment_date": payment.payment_date,
-                    "amount": payment.amount,
-                    "cohort_month": payment.cohort_month,
-                }
-            )
-
-        df = pd.DataFrame(data)
-        logger.debug("DataFrame created", rows=len(df), columns=list(df.columns))
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        # Compact dtypes for the aggregate-only consumers: categorical ids
+        # group on small integer codes instead of hashing strings, and real
+        # datetime64 date columns spare downstream code a parse pass over
+        # Python date objects. Amounts stay float64 — sub-cent inputs must
+        # survive the round trip exactly.
+        df["customer_id"] = df["customer_id"].astype("category")
+        df["payment_date"] = pd.to_datetime(df["payment_date"])
+        df["cohort_month"] = pd.to_datetime(df["cohort_month"])
+        df["amount"] = df["amount"].astype(np.float64)
+        logger.debug("DataFrame created", rows=len(df), columns=columns)
         return df
 
 
@@ -246,7 +454,9 @@ class ThresholdOperations:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_threshold(self, company_id: int, payment_period_month: int, minimum_payment_percent: float) -> Threshold:
+    def create_threshold(
+        self, company_id: int, payment_period_month: int, minimum_payment_percent: float, commit: bool = True
+    ) -> Threshold:
         """Create a new threshold"""
         logger.info(
             "Creating threshold",
@@ -261,12 +471,35 @@ class ThresholdOperations:
             minimum_payment_percent=minimum_payment_percent,
         )
         self.db.add(threshold)
-        self.db.commit()
-        self.db.refresh(threshold)
+        if commit:
+            self.db.commit()
+            self.db.refresh(threshold)
+        else:
+            self.db.flush()
 
         logger.info("Threshold created", threshold_id=threshold.id)
         return threshold
 
+    def create_thresholds(self, company_id: int, thresholds: List[Dict[str, Any]]) -> List[Threshold]:
+        """Create several thresholds for a company in one transaction"""
+        logger.info("Creating thresholds", company_id=company_id, count=len(thresholds))
+
+        db_thresholds = [
+            Threshold(
+                company_id=company_id,
+                payment_period_month=threshold["payment_period_month"],
+                minimum_payment_percent=threshold["minimum_payment_percent"],
+            )
+            for threshold in thresholds
+        ]
+        self.db.add_all(db_thresholds)
+        self.db.commit()
+        for threshold in db_thresholds:
+            self.db.refresh(threshold)
+
+        logger.info("Thresholds created", company_id=company_id, count=len(db_thresholds))
+        return db_thresholds
+
     def get_threshold_by_id(self, threshold_id: int) -> Optional[Threshold]:
         """Get threshold by ID"""
         logger.debug("Fetching threshold", threshold_id=threshold_id)
@@ -293,6 +526,7 @@ class ThresholdOperations:
 
         self.db.commit()
         self.db.refresh(threshold)
+        _invalidate_analytics_cache(threshold.company_id)
 
         logger.info("Threshold updated", threshold_id=threshold_id)
         return threshold
@@ -309,7 +543,7 @@ class SpendOperations:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_spend(self, company_id: int, cohort_month: date, spend: float) -> Spend:
+    def create_spend(self, company_id: int, cohort_month: date, spend: float, commit: bool = True) -> Spend:
         """Create a new spend record"""
         logger.info(
             "Creating spend",
@@ -324,8 +558,11 @@ class SpendOperations:
             spend=spend,
         )
         self.db.add(spend_record)
-        self.db.commit()
-        self.db.refresh(spend_record)
+        if commit:
+            self.db.commit()
+            self.db.refresh(spend_record)
+        else:
+            self.db.flush()
 
         logger.info("Spend created", spend_id=spend_record.id)
         return spend_record
@@ -350,6 +587,7 @@ class SpendOperations:
             logger.warning("Spend not found for update", spend_id=spend_id)
             return None
 
+        previous_company_id = spend_record.company_id
         if company_id is not None:
             spend_record.company_id = company_id
         if cohort_month is not None:
@@ -359,6 +597,9 @@ class SpendOperations:
 
         self.db.commit()
         self.db.refresh(spend_record)
+        _invalidate_analytics_cache(previous_company_id)
+        if spend_record.company_id != previous_company_id:
+            _invalidate_analytics_cache(spend_record.company_id)
 
         logger.info("Spend updated", spend_id=spend_id)
         return spend_record
@@ -404,25 +645,22 @@ class SpendOperations:
         )
 
     def get_spends_dataframe(self, company_id: int) -> pd.DataFrame:
-        """Get spends as pandas DataFrame for calculations"""
+        """Get spends as pandas DataFrame for calculations.
+
+        Same shape as get_payments_dataframe: Core column tuples straight
+        into from_records, with no ORM hydration or per-row dicts.
+        """
         logger.debug("Converting spends to DataFrame", company_id=company_id)
 
-        spends = self.list_spends_by_company(company_id)
+        rows = self.db.execute(
+            select(Spend.cohort_month, Spend.spend).where(Spend.company_id == company_id)
+        ).all()
 
-        if not spends:
+        if not rows:
             logger.warning("No spends found", company_id=company_id)
             return pd.DataFrame()
 
-        data = []
-        for spend in spends:
-            data.append(
-                {
-                    "cohort": spend.cohort_month,
-                    "spend": spend.spend,
-                }
-            )
-
-        df = pd.DataFrame(data)
+        df = pd.DataFrame.from_records(rows, columns=["cohort", "spend"])
         logger.debug("DataFrame created", rows=len(df), columns=list(df.columns))
         return df
 
@@ -468,15 +706,47 @@ class CustomerOperations:
 class AnalyticsOperations:
     """Database operations for analytics and calculations"""
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        payments: Optional[PaymentOperations] = None,
+        trades: Optional[TradeOperations] = None,
+        thresholds: Optional[ThresholdOperations] = None,
+        spends: Optional[SpendOperations] = None,
+    ):
         self.db = db
-        self.payments = PaymentOperations(db)
-        self.trades = TradeOperations(db)
-        self.thresholds = ThresholdOperations(db)
-        self.spends = SpendOperations(db)
+        # Accept pre-built per-session instances so DatabaseOperations can
+        # share its own rather than constructing a second set per request
+        self.payments = payments or PaymentOperations(db)
+        self.trades = trades or TradeOperations(db)
+        self.thresholds = thresholds or ThresholdOperations(db)
+        self.spends = spends or SpendOperations(db)
+
+    def _data_version(self, company_id: int) -> tuple:
+        """Cheap per-table stamp that moves whenever rows are inserted or deleted.
+
+        The four per-table aggregates travel as one UNION ALL statement, so
+        the stamp — the only query a cache hit pays — costs a single round
+        trip; the literal ordinal pins branch order regardless of how the
+        backend returns the rows.
+        """
+        parts = [
+            select(literal(ordinal), func.max(model.id), func.count(model.id)).where(
+                model.company_id == company_id
+            )
+            for ordinal, model in enumerate((Payment, Trade, Threshold, Spend))
+        ]
+        rows = sorted(self.db.execute(union_all(*parts)).all())
+        return tuple(value for _, max_id, count in rows for value in (max_id, count))
 
     def get_company_data_for_analytics(self, company_id: int) -> Dict[str, Any]:
         """Get all company data needed for analytics calculations"""
+        version = self._data_version(company_id)
+        cached = _analytics_data_cache.get(company_id)
+        if cached is not None and cached[0] == version:
+            logger.debug("Analytics data cache hit", company_id=company_id)
+            return cached[1]
+
         logger.debug("Fetching analytics data", company_id=company_id)
 
         # Get payments as DataFrame
@@ -485,28 +755,37 @@ class AnalyticsOperations:
         # Get spends as DataFrame
         spend_df = self.spends.get_spends_dataframe(company_id)
 
-        # Get trades (trading terms)
-        trades = self.trades.list_trades_by_company(company_id)
-        trade_list = []
-        for trade in trades:
-            trade_list.append(
-                {
-                    "cohort_month": trade.cohort_month.strftime("%Y-%m-%d"),
-                    "sharing_percentage": trade.sharing_percentage,
-                    "cash_cap": trade.cash_cap,
-                }
+        # Get trades (trading terms) - only the three columns the output needs
+        trade_rows = self.db.execute(
+            select(Trade.cohort_month, Trade.sharing_percentage, Trade.cash_cap).where(
+                Trade.company_id == company_id
             )
-
-        # Get thresholds
-        thresholds = self.thresholds.list_thresholds_by_company(company_id)
-        threshold_list = []
-        for threshold in thresholds:
-            threshold_list.append(
-                {
-                    "payment_period_month": threshold.payment_period_month,
-                    "minimum_payment_percent": threshold.minimum_payment_percent,
-                }
+        ).all()
+        if trade_rows:
+            # One vectorized strftime over the month column instead of a
+            # datetime.strftime call per trade row.
+            months, shares, caps = zip(*trade_rows)
+            month_strs = pd.DatetimeIndex(months).strftime("%Y-%m-%d")
+            trade_list = [
+                {"cohort_month": month, "sharing_percentage": share, "cash_cap": cap}
+                for month, share, cap in zip(month_strs, shares, caps)
+            ]
+        else:
+            trade_list = []
+
+        # Get thresholds - likewise at the Core level, skipping ORM hydration
+        threshold_rows = self.db.execute(
+            select(Threshold.payment_period_month, Threshold.minimum_payment_percent).where(
+                Threshold.company_id == company_id
             )
+        ).all()
+        threshold_list = [
+            {
+                "payment_period_month": payment_period_month,
+                "minimum_payment_percent": minimum_payment_percent,
+            }
+            for payment_period_month, minimum_payment_percent in threshold_rows
+        ]
 
         data = {
             "payments_df": payments_df,
@@ -524,6 +803,7 @@ class AnalyticsOperations:
             trades_count=len(trade_list),
         )
 
+        _analytics_data_cache[company_id] = (version, data)
         return data
 
 
@@ -539,10 +819,17 @@ class DatabaseOperations:
         self.thresholds = ThresholdOperations(db)
         self.spends = SpendOperations(db)
         self.customers = CustomerOperations(db)
-        self.analytics = AnalyticsOperations(db)
+        self.analytics = AnalyticsOperations(
+            db, payments=self.payments, trades=self.trades, thresholds=self.thresholds, spends=self.spends
+        )
 
 
 # Factory function for dependency injection
 def get_db_operations(db: Session = Depends(get_db)) -> DatabaseOperations:
     """Factory function to get session-aware DatabaseOperations instance"""
     return DatabaseOperations(db)
+
+
+def get_read_db_operations(db: Session = Depends(get_read_db)) -> DatabaseOperations:
+    """DatabaseOperations bound to the read-only session profile"""
+    return DatabaseOperations(db)
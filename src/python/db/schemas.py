@@ -52,6 +52,7 @@ class Trade(Base):
         UniqueConstraint("company_id", "cohort_month", name="unique_company_cohort_month"),
         CheckConstraint("sharing_percentage >= 0 AND sharing_percentage <= 1", name="check_sharing_percentage"),
         CheckConstraint("cash_cap >= 0", name="check_cash_cap"),
+        Index("ix_trades_company_cohort_month", "company_id", "cohort_month"),
     )
 
     # Relationships
@@ -69,6 +70,15 @@ class Payment(Base):
     amount = Column(Numeric, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Constraints
+    __table_args__ = (
+        # Match the hot WHERE clauses: company scans for cashflow computation
+        # and (company, customer) lookups for cohort assignment
+        Index("ix_payments_company_cohort_month", "company_id", "cohort_month"),
+        Index("ix_payments_company_customer", "company_id", "customer_id"),
+        Index("ix_payments_company_payment_date", "company_id", "payment_date"),
+    )
+
     # Relationships
     company = relationship("Company", back_populates="payments")
 
@@ -88,6 +98,7 @@ class Threshold(Base):
         CheckConstraint(
             "minimum_payment_percent >= 0 AND minimum_payment_percent <= 1", name="check_minimum_payment_percent"
         ),
+        Index("ix_thresholds_company_id", "company_id"),
     )
 
     # Relationships
@@ -107,6 +118,7 @@ class Spend(Base):
     __table_args__ = (
         UniqueConstraint("company_id", "cohort_month", name="unique_company_spend_cohort_month"),
         CheckConstraint("spend >= 0", name="check_spend_positive"),
+        Index("ix_spends_company_cohort_month", "company_id", "cohort_month"),
     )
 
     # Relationships
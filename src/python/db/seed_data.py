@@ -4,6 +4,7 @@ Seeds the database with sample data for development and testing
 Data is organized by cohort month with comprehensive coverage
 """
 
+from sqlalchemy import insert
 from sqlalchemy.orm import sessionmaker
 import structlog
 from datetime import datetime, date
@@ -847,19 +848,23 @@ def seed_companies(session):
     """Seed companies table with sample data"""
     logger.info("Seeding companies")
     
-    created_companies = {}
-    for company_name in SEED_DATA_BY_COHORT_MONTH.keys():
-        # Check if company already exists
-        existing = session.query(Company).filter_by(name=company_name).first()
-        if existing:
-            logger.info("Company already exists", name=company_name, id=existing.id)
-            created_companies[company_name] = existing
-            continue
-
-        company = Company(name=company_name, created_at=datetime.utcnow())
-        session.add(company)
-        session.flush()  # Flush to get the ID
-        created_companies[company_name] = company
+    # One IN query resolves every existing company instead of a lookup
+    # per name; only the genuinely new ones are added and flushed for ids
+    names = list(SEED_DATA_BY_COHORT_MONTH.keys())
+    created_companies = {
+        company.name: company for company in session.query(Company).filter(Company.name.in_(names))
+    }
+    for name, company in created_companies.items():
+        logger.info("Company already exists", name=name, id=company.id)
+
+    new_companies = [
+        Company(name=name, created_at=datetime.utcnow()) for name in names if name not in created_companies
+    ]
+    if new_companies:
+        session.add_all(new_companies)
+        session.flush()  # Flush to get the IDs
+    for company in new_companies:
+        created_companies[company.name] = company
         logger.info("Created company", name=company.name, id=company.id)
 
     return created_companies
@@ -922,30 +927,30 @@ def seed_payments(session, companies):
     """Seed payments table using cohort month organized data"""
     logger.info("Seeding payments from cohort month organized data")
 
-    payments_created = 0
-    
+    # One upfront key scan replaces a per-row existence query, and the set
+    # also catches duplicates within the seed data itself
+    existing_keys = {
+        (company_id, customer_id, payment_date)
+        for company_id, customer_id, payment_date in session.query(
+            Payment.company_id, Payment.customer_id, Payment.payment_date
+        )
+    }
+
+    payment_rows = []
+
     for company_name, company_data in SEED_DATA_BY_COHORT_MONTH.items():
         company = companies[company_name]
-        
+
         for cohort_month, monthly_data in company_data["monthly_data"].items():
             payments_data = monthly_data.get("payments", [])
-            
+
             if not payments_data:
                 continue  # No payments for this cohort month
 
             for payment_data in payments_data:
-                # Check if payment already exists (basic duplicate prevention)
-                existing = (
-                    session.query(Payment)
-                    .filter_by(
-                        company_id=company.id,
-                        customer_id=payment_data["customer_id"],
-                        payment_date=payment_data["payment_date"],
-                    )
-                    .first()
-                )
-
-                if existing:
+                # Basic duplicate prevention
+                key = (company.id, payment_data["customer_id"], payment_data["payment_date"])
+                if key in existing_keys:
                     logger.info(
                         "Payment already exists",
                         company=company_name,
@@ -954,16 +959,17 @@ def seed_payments(session, companies):
                     )
                     continue
 
-                payment = Payment(
-                    company_id=company.id,
-                    customer_id=payment_data["customer_id"],
-                    payment_date=payment_data["payment_date"],
-                    cohort_month=cohort_month,
-                    amount=payment_data["amount"],
-                    created_at=datetime.utcnow(),
+                existing_keys.add(key)
+                payment_rows.append(
+                    {
+                        "company_id": company.id,
+                        "customer_id": payment_data["customer_id"],
+                        "payment_date": payment_data["payment_date"],
+                        "cohort_month": cohort_month,
+                        "amount": payment_data["amount"],
+                        "created_at": datetime.utcnow(),
+                    }
                 )
-                session.add(payment)
-                payments_created += 1
                 logger.debug(
                     "Created payment",
                     company=company_name,
@@ -971,92 +977,90 @@ def seed_payments(session, companies):
                     amount=payment_data["amount"],
                 )
 
-    logger.info("Created payments", total_created=payments_created)
+    # Single Core executemany instead of one ORM add per payment
+    if payment_rows:
+        session.execute(insert(Payment), payment_rows)
+
+    logger.info("Created payments", total_created=len(payment_rows))
 
 
 def seed_thresholds(session, companies):
     """Seed thresholds table using cohort month organized data"""
     logger.info("Seeding thresholds from cohort month organized data")
 
-    thresholds_created = 0
-    
+    # Same batched shape as seed_payments: one upfront key scan, one
+    # executemany, instead of a SELECT-then-add round trip per threshold
+    existing_keys = set(session.query(Threshold.company_id, Threshold.payment_period_month))
+
+    threshold_rows = []
+
     for company_name, company_data in SEED_DATA_BY_COHORT_MONTH.items():
         company = companies[company_name]
         thresholds_data = company_data.get("threshold", [])
 
         for threshold_data in thresholds_data:
-            # Check if threshold already exists
-            existing = (
-                session.query(Threshold)
-                .filter_by(company_id=company.id, payment_period_month=threshold_data["payment_period_month"])
-                .first()
-            )
-
-            if existing:
+            key = (company.id, threshold_data["payment_period_month"])
+            if key in existing_keys:
                 logger.info(
                     "Threshold already exists",
                     company=company_name,
                     payment_period_month=threshold_data["payment_period_month"],
                 )
                 continue
-
-            threshold = Threshold(
-                company_id=company.id,
-                payment_period_month=threshold_data["payment_period_month"],
-                minimum_payment_percent=threshold_data["minimum_payment_percent"],
-                created_at=datetime.utcnow(),
-            )
-            session.add(threshold)
-            thresholds_created += 1
-            logger.debug(
-                "Created threshold",
-                company=company_name,
-                payment_period_month=threshold_data["payment_period_month"],
-                minimum_payment_percent=threshold_data["minimum_payment_percent"],
+            existing_keys.add(key)
+
+            threshold_rows.append(
+                {
+                    "company_id": company.id,
+                    "payment_period_month": threshold_data["payment_period_month"],
+                    "minimum_payment_percent": threshold_data["minimum_payment_percent"],
+                    "created_at": datetime.utcnow(),
+                }
             )
 
-    logger.info("Created thresholds", total_created=thresholds_created)
+    if threshold_rows:
+        session.execute(insert(Threshold), threshold_rows)
+
+    logger.info("Created thresholds", total_created=len(threshold_rows))
 
 
 def seed_spends(session, companies):
     """Seed spends table using cohort month organized data"""
     logger.info("Seeding spends from cohort month organized data")
 
-    spends_created = 0
+    # Batched like seed_payments: one key scan, one executemany
+    existing_keys = set(session.query(Spend.company_id, Spend.cohort_month))
+
+    spend_rows = []
 
     for company_name, company_data in SEED_DATA_BY_COHORT_MONTH.items():
         company = companies[company_name]
-        
+
         for cohort_month, monthly_data in company_data["monthly_data"].items():
             spend_data = monthly_data.get("spend")
-            
+
             if spend_data is None:
                 continue  # No spend for this cohort month
-                
-            # Check if spend already exists
-            existing = session.query(Spend).filter_by(company_id=company.id, cohort_month=cohort_month).first()
 
-            if existing:
+            key = (company.id, cohort_month)
+            if key in existing_keys:
                 logger.debug("Spend already exists", company=company_name, cohort_month=cohort_month)
                 continue
-
-            spend = Spend(
-                company_id=company.id,
-                cohort_month=cohort_month,
-                spend=spend_data["amount"],
-                created_at=datetime.utcnow(),
+            existing_keys.add(key)
+
+            spend_rows.append(
+                {
+                    "company_id": company.id,
+                    "cohort_month": cohort_month,
+                    "spend": spend_data["amount"],
+                    "created_at": datetime.utcnow(),
+                }
             )
-            session.add(spend)
-            spends_created += 1
 
-            logger.debug(
-                "Created spend entry", 
-                company=company_name, 
-                cohort_month=cohort_month, 
-                spend_amount=spend_data["amount"]
-            )
+    if spend_rows:
+        session.execute(insert(Spend), spend_rows)
 
-    logger.info("Created spends", total_created=spends_created)
+    logger.info("Created spends", total_created=len(spend_rows))
 
 
 def seed_customers(session, companies):
@@ -1,17 +1,39 @@
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from collections import defaultdict
+import logging
+import os
 import structlog
 from src.python.utils.calc import compute_company_cohort_cashflows
 import src.python.models.models as models
 from src.python.utils.csv_processor import get_payments_csv_processor
-from src.python.db.db_operations import get_db_operations, DatabaseOperations
+from src.python.db.db_operations import get_db_operations, get_read_db_operations, DatabaseOperations
 
 FORECAST_TIMEFRAME = 36
 
+# The filtering bound logger turns suppressed calls into cheap no-ops before
+# the processor chain runs; the hot query paths log at debug on every call,
+# so this matters at INFO, the default level.
+_LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(_LOG_LEVEL))
+
 logger = structlog.get_logger(__file__)
 
+# Cashflow responses are pure functions of a company's stored data, so cache
+# them per (company_id, churn, data_version). Write endpoints bump the
+# company's version, which both invalidates and evicts its cached entries.
+_cashflow_cache: Dict[Tuple[int, Optional[float], int], "models.CashflowResponse"] = {}
+_company_data_versions: Dict[int, int] = defaultdict(int)
+
+
+def _bump_company_data_version(company_id: int) -> None:
+    """Invalidate cached cashflows after a write to the company's data"""
+    _company_data_versions[company_id] += 1
+    for key in [k for k in _cashflow_cache if k[0] == company_id]:
+        _cashflow_cache.pop(key, None)
+
 app = FastAPI(
     title="CVF Portfolio Management API",
     description="""
@@ -88,6 +110,27 @@ async def create_company(company: models.CompanyCreate, db_ops: DatabaseOperatio
         raise HTTPException(status_code=500, detail="Failed to create company")
 
 
+@app.post("/companies/bulk", response_model=List[models.CompanyResponse], tags=["Companies"])
+async def create_companies_bulk(
+    companies: List[models.CompanyCreate], db_ops: DatabaseOperations = Depends(get_db_operations)
+):
+    """Create several companies in one request"""
+    logger.info("Creating companies in bulk", count=len(companies))
+
+    names = [company.name for company in companies]
+    existing = [name for name in names if db_ops.companies.get_company_by_name(name)]
+    if existing:
+        logger.warning("Companies already exist", names=existing)
+        raise HTTPException(status_code=400, detail=f"Companies with these names already exist: {existing}")
+
+    try:
+        db_companies = db_ops.companies.create_companies(names)
+        return [models.CompanyResponse.from_db(company) for company in db_companies]
+    except Exception as e:
+        logger.error("Failed to create companies in bulk", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to create companies")
+
+
 @app.get("/companies/", response_model=List[models.CompanyResponse], tags=["Companies"])
 async def list_companies(db_ops: DatabaseOperations = Depends(get_db_operations)):
     """List all companies"""
@@ -126,6 +169,7 @@ async def create_trade(company_id: int, trade: models.TradeCreate, db_ops: Datab
 
     try:
         db_trade = db_ops.trades.create_trade(company_id, trade.cohort_month, trade.sharing_percentage, trade.cash_cap)
+        _bump_company_data_version(company_id)
         return models.TradeResponse.from_db(db_trade)
     except Exception as e:
         logger.error("Failed to create trade", company_id=company_id, error=str(e))
@@ -156,6 +200,7 @@ async def upload_payments(
     # Use the CSV processor to handle the upload
     csv_processor = get_payments_csv_processor()
     result = await csv_processor.process_file(company_id, file, db_ops.db)
+    _bump_company_data_version(company_id)
 
     logger.info("Payment upload completed", company_id=company_id, filename=file.filename, result=result)
 
@@ -264,6 +309,7 @@ async def update_company_payment(
             logger.error("Failed to update company payment", company_id=company_id, payment_id=payment_id)
             raise HTTPException(status_code=500, detail="Failed to update payment")
 
+        _bump_company_data_version(company_id)
         return models.PaymentResponse.from_db(updated_payment)
 
     except HTTPException:
@@ -308,6 +354,7 @@ async def delete_company_payment(
             logger.error("Failed to delete company payment", company_id=company_id, payment_id=payment_id)
             raise HTTPException(status_code=500, detail="Failed to delete payment")
 
+        _bump_company_data_version(company_id)
         logger.info("Payment deleted successfully", company_id=company_id, payment_id=payment_id)
         return {"message": "Payment deleted successfully", "payment_id": payment_id}
 
@@ -326,9 +373,31 @@ async def create_threshold(
     db_threshold = db_ops.thresholds.create_threshold(
         company_id, threshold.payment_period_month, threshold.minimum_payment_percent
     )
+    _bump_company_data_version(company_id)
     return models.ThresholdResponse.from_db(db_threshold)
 
 
+@app.post(
+    "/companies/{company_id}/thresholds/bulk", response_model=List[models.ThresholdResponse], tags=["Thresholds"]
+)
+async def create_thresholds_bulk(
+    company_id: int, thresholds: List[models.ThresholdCreate], db_ops: DatabaseOperations = Depends(get_db_operations)
+):
+    """Create several thresholds for a company in one request"""
+    db_thresholds = db_ops.thresholds.create_thresholds(
+        company_id,
+        [
+            {
+                "payment_period_month": threshold.payment_period_month,
+                "minimum_payment_percent": threshold.minimum_payment_percent,
+            }
+            for threshold in thresholds
+        ],
+    )
+    _bump_company_data_version(company_id)
+    return [models.ThresholdResponse.from_db(threshold) for threshold in db_thresholds]
+
+
 @app.get("/companies/{company_id}/thresholds/", response_model=List[models.ThresholdResponse], tags=["Thresholds"])
 async def list_thresholds(company_id: int, db_ops: DatabaseOperations = Depends(get_db_operations)):
     db_thresholds = db_ops.thresholds.list_thresholds_by_company(company_id)
@@ -388,6 +457,7 @@ async def update_threshold(
             logger.error("Failed to update threshold", company_id=company_id, threshold_id=threshold_id)
             raise HTTPException(status_code=500, detail="Failed to update threshold")
 
+        _bump_company_data_version(company_id)
         return models.ThresholdResponse.from_db(updated_threshold)
 
     except HTTPException:
@@ -453,6 +523,7 @@ async def create_company_spend(
         # Create spend
         db_spend = db_ops.spends.create_spend(company_id=company_id, cohort_month=spend.cohort_month, spend=spend.spend)
 
+        _bump_company_data_version(company_id)
         return models.SpendResponse.from_db(db_spend)
 
     except HTTPException:
@@ -580,6 +651,7 @@ async def update_company_spend(
             logger.error("Failed to update company spend", company_id=company_id, spend_id=spend_id)
             raise HTTPException(status_code=500, detail="Failed to update spend")
 
+        _bump_company_data_version(company_id)
         return models.SpendResponse.from_db(updated_spend)
 
     except HTTPException:
@@ -590,7 +662,9 @@ async def update_company_spend(
 
 
 @app.get("/companies/{company_id}/cashflows")
-async def get_cashflows(company_id: int, db_ops: DatabaseOperations = Depends(get_db_operations)) -> models.CashflowResponse:
+async def get_cashflows(
+    company_id: int, db_ops: DatabaseOperations = Depends(get_read_db_operations)
+) -> models.CashflowResponse:
     """Get cashflow data with cohort trading details"""
     logger.info("Getting cashflows", company_id=company_id)
 
@@ -600,15 +674,23 @@ async def get_cashflows(company_id: int, db_ops: DatabaseOperations = Depends(ge
             logger.warning("Company not found for payment deletion", company_id=company_id)
             raise HTTPException(status_code=404, detail="Company not found")
 
+        cache_key = (company_id, None, _company_data_versions[company_id])
+        cached = _cashflow_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Cashflows served from cache", company_id=company_id)
+            return cached
+
         trades = db_ops.trades.list_trades_by_company(company_id)
-        payments = db_ops.payments.list_payments_by_company(company_id)
+        payments = db_ops.payments.iter_payment_rows(company_id)
         spends = db_ops.spends.list_spends_by_company(company_id)
         thresholds = db_ops.thresholds.list_thresholds_by_company(company_id)
         cohorts = compute_company_cohort_cashflows(
             company_id=company_id, trades=trades, payments=payments, spends=spends, thresholds=thresholds
         )
         logger.info("Cashflows generated", company_id=company_id)
-        return models.CashflowResponse(cohorts=cohorts)
+        response = models.CashflowResponse(cohorts=cohorts)
+        _cashflow_cache[cache_key] = response
+        return response
 
     except Exception as e:
         logger.error("Error generating cashflows", company_id=company_id, error=str(e))
@@ -618,9 +700,9 @@ async def get_cashflows(company_id: int, db_ops: DatabaseOperations = Depends(ge
 
 @app.post("/companies/{company_id}/cashflows/predicted")
 async def get_predicted_cashflows(
-    company_id: int, 
-    request: models.CashflowRequest, 
-    db_ops: DatabaseOperations = Depends(get_db_operations)
+    company_id: int,
+    request: models.CashflowRequest,
+    db_ops: DatabaseOperations = Depends(get_read_db_operations)
 ) -> models.CashflowResponse:
     """Get predicted cashflow data with cohort trading details and optional churn rate"""
     logger.info("Getting predicted cashflows", company_id=company_id, churn=request.churn)
@@ -631,8 +713,14 @@ async def get_predicted_cashflows(
             logger.warning("Company not found for predicted cashflows", company_id=company_id)
             raise HTTPException(status_code=404, detail="Company not found")
 
+        cache_key = (company_id, request.churn, _company_data_versions[company_id])
+        cached = _cashflow_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Predicted cashflows served from cache", company_id=company_id, churn=request.churn)
+            return cached
+
         trades = db_ops.trades.list_trades_by_company(company_id)
-        payments = db_ops.payments.list_payments_by_company(company_id)
+        payments = db_ops.payments.iter_payment_rows(company_id)
         spends = db_ops.spends.list_spends_by_company(company_id)
         thresholds = db_ops.thresholds.list_thresholds_by_company(company_id)
         
@@ -642,7 +730,9 @@ async def get_predicted_cashflows(
         )
         
         logger.info("Predicted cashflows generated", company_id=company_id, churn=request.churn)
-        return models.CashflowResponse(cohorts=cohorts)
+        response = models.CashflowResponse(cohorts=cohorts)
+        _cashflow_cache[cache_key] = response
+        return response
 
     except Exception as e:
         logger.error("Error generating predicted cashflows", company_id=company_id, error=str(e))
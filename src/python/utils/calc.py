@@ -6,16 +6,34 @@ Based on the Jupyter notebook exercises
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
-from dateutil.relativedelta import relativedelta
+from datetime import date
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from src.python.db.schemas import Trade, Payment, Spend, Threshold
 from src.python.models.models import Cohort, FundedCohort, Period, FundedPeriod, PredictedFundedPeriod
 from dataclasses import dataclass, field
+from functools import lru_cache
 import numpy_financial as npf
-from decimal import Decimal
 
 PREDICTION_LENGTH_MONTHS = 36
 
+# Cohorts are computed independently; below this count the thread-pool
+# dispatch overhead outweighs the parallelism win.
+PARALLEL_COHORT_MIN = 8
+
+
+@dataclass
+class _ConsolidatedCohort:
+    spend: Spend
+    trade: Optional[Trade] = None
+    payments: List[Payment] = field(default_factory=list)
+
+
+def _next_month(d: date) -> date:
+    """Step a month-start date forward one month using integer arithmetic,
+    avoiding a relativedelta allocation per step."""
+    n = d.year * 12 + d.month  # ordinal of the following month
+    return date(n // 12, n % 12 + 1, 1)
 
 def _aggregate_payments_by_month(payments: List[Payment]) -> Dict:
     payments_by_month = defaultdict(list)
@@ -24,137 +42,471 @@ def _aggregate_payments_by_month(payments: List[Payment]) -> Dict:
         payments_by_month[month_key].append(p)
     return payments_by_month
 
-def _calculate_funded_cohort_irr(spend: float, periods: List[FundedPeriod | PredictedFundedPeriod]) -> Optional[float]:                                                        
-    """Calculate IRR for a funded cohort using collected amounts"""                                                                                   
+def _calculate_funded_cohort_irr(spend: float, periods: List[FundedPeriod | PredictedFundedPeriod]) -> Optional[float]:
+    """Calculate IRR for a funded cohort using collected amounts"""
     cash_flows = [-spend]
     cash_flows += [p.payment for p in periods]
     monthly_irr = npf.irr(cash_flows)
     annual_irr = (1 + monthly_irr) ** 12 - 1
     return annual_irr
 
-def _is_predicted_period(period_num: int, payments_by_month: Dict, churn: Optional[float]) -> bool:
-    return False if churn is None else period_num >= len(payments_by_month)-1
+def _is_predicted_period(period_num: int, num_periods_base: int, churn: Optional[float]) -> bool:
+    return False if churn is None else period_num >= num_periods_base-1
 
-def _compute_prediction_for_period(periods : List[FundedPeriod | PredictedFundedPeriod], churn : float) -> Decimal:
-    return Decimal(periods[-1].payment * (1-churn))
+def _compute_prediction_for_period(periods : List[FundedPeriod | PredictedFundedPeriod], churn : float) -> float:
+    return periods[-1].payment * (1-churn)
 
-def compute_company_cohort_cashflows(
-    company_id: str, trades: List[Trade], payments: List[Payment], spends: List[Spend], thresholds: List[Threshold], churn: Optional[float] = None
-) -> List[FundedCohort | Cohort]:
-    
-    @dataclass
-    class ConsolidatedCohort:
-        spend: Spend
-        trade: Optional[Trade] = None
-        payments: List[Payment] = field(default_factory=list)
-
-    consolidated = {s.cohort_month: ConsolidatedCohort(spend=s) for s in spends}
-    for tr in trades:
-        consolidated[tr.cohort_month].trade = tr
-    for p in payments:
-        consolidated[p.cohort_month].payments.append(p)
+def _effective_share_for_period(
+    payment_sum: float, spend: float, base_share: float, threshold_share: Optional[float]
+) -> tuple[bool, float]:
+    """Resolve the share rate for one period: 100% sharing when the period's
+    payment percentage misses its minimum threshold, the trade's base rate
+    otherwise. Operates on plain floats so the hot loop carries no ORM
+    attribute lookups."""
+    threshold_failed = threshold_share is not None and payment_sum / spend < threshold_share
+    share_applied = 1 if threshold_failed else base_share
+    return threshold_failed, share_applied
 
-    cohorts: List[FundedCohort | Cohort] = []
-    for cohort_month, ch in consolidated.items():
-        payments_by_month = _aggregate_payments_by_month(payments=ch.payments)
-        thresholds_by_period_num = {th.payment_period_month: th for th in thresholds}
-        customers = [p.customer_id for p in payments]
+def _compute_cohort(
+    company_id: str, cohort_month: date, ch: _ConsolidatedCohort, thresholds_by_period_num: Dict, churn: Optional[float]
+) -> FundedCohort | Cohort:
+    """Compute the full period series for one cohort. Independent of every
+    other cohort, so callers may fan these out across a thread pool."""
+    payments_by_month = _aggregate_payments_by_month(payments=ch.payments)
+    customers = [p.customer_id for p in ch.payments]
 
-        cumulative_payment = 0
-        cumulative_collected = 0
-        capped = False
+    # Dense per-month payment totals: one NumPy pass replaces re-summing
+    # payment lists on every period iteration.
+    month_keys = list(payments_by_month.keys())
+    pays = np.array(
+        [sum(float(p.amount) for p in payments_by_month[m]) for m in month_keys], dtype=np.float64
+    )
+    cum_pays = np.cumsum(pays)
 
-        periods = []
-        num_periods_base = len(payments_by_month)
-        num_periods = max(num_periods_base, PREDICTION_LENGTH_MONTHS) if churn is not None and ch.trade else num_periods_base
-        latest_period_month = None
+    cumulative_payment = 0.0
+    cumulative_collected = 0.0
+    capped = False
 
-        for period_num in range(num_periods):
+    periods = []
+    num_periods_base = len(month_keys)
+    num_periods = max(num_periods_base, PREDICTION_LENGTH_MONTHS) if churn is not None and ch.trade else num_periods_base
+    latest_period_month = None
 
-            payment_sum: Optional[float] = None
-            predicted = _is_predicted_period(period_num, payments_by_month, churn)
-            if not predicted:
-                payment_period_month = list(payments_by_month.keys())[period_num]
-                payments = payments_by_month[payment_period_month]
-                payment_sum = sum([p.amount for p in payments])
+    spend = float(ch.spend.spend)
+    if ch.trade:
+        base_share = float(ch.trade.sharing_percentage)
+        cash_cap = float(ch.trade.cash_cap)
+
+        # Prefix-sum the actual (non-predicted) region once: resolving the
+        # share per period and clamping the running total against the cap
+        # collapses the per-period min/accumulate chain into array lookups.
+        n_actual = num_periods_base if churn is None else num_periods_base - 1
+        if n_actual > 0:
+            if not thresholds_by_period_num:
+                # No thresholds means the share never flips, so the whole
+                # region specializes to one capped scaling of the prefix sums.
+                failed_vec = np.zeros(n_actual, dtype=bool)
+                share_vec = np.full(n_actual, base_share)
+                cum_collected_vec = np.minimum(base_share * cum_pays[:n_actual], cash_cap)
             else:
-                payment_period_month = latest_period_month + relativedelta(months = 1)
-                payment_sum = _compute_prediction_for_period(periods, churn)
-            
-            latest_period_month = payment_period_month
+                threshold_share_vec = np.full(n_actual, np.nan)
+                for pn, th_share in thresholds_by_period_num.items():
+                    if 0 <= pn < n_actual:
+                        threshold_share_vec[pn] = th_share
+                has_threshold = ~np.isnan(threshold_share_vec)
+                failed_vec = np.zeros(n_actual, dtype=bool)
+                failed_vec[has_threshold] = (
+                    pays[:n_actual][has_threshold] / spend < threshold_share_vec[has_threshold]
+                )
+                share_vec = np.where(failed_vec, 1.0, base_share)
+                cum_collected_vec = np.minimum(np.cumsum(share_vec * pays[:n_actual]), cash_cap)
+            collected_vec = np.diff(cum_collected_vec, prepend=0.0)
+
+    for period_num in range(num_periods):
+
+        predicted = _is_predicted_period(period_num, num_periods_base, churn)
+        if not predicted:
+            payment_period_month = month_keys[period_num]
+            payment_sum = float(pays[period_num])
+            cumulative_payment = float(cum_pays[period_num])
+        else:
+            payment_period_month = _next_month(latest_period_month)
+            payment_sum = _compute_prediction_for_period(periods, churn)
             cumulative_payment += payment_sum
 
-            if ch.trade:
-                payment_percentage = payment_sum / ch.spend.spend
-                threshold = thresholds_by_period_num.get(period_num, None)
-                threshold_failed = threshold is not None and payment_percentage < threshold.minimum_payment_percent
-                threshold_payment_share = threshold.minimum_payment_percent if threshold is not None else None
-                threshold_payment_percentage = threshold_payment_share*100 if threshold_payment_share is not None else None
-                threshold_expected_payment = threshold_payment_share * ch.spend.spend if threshold_payment_share else None
-                share_applied = 1 if threshold_failed else ch.trade.sharing_percentage
-                collected = min(share_applied * payment_sum, ch.trade.cash_cap - cumulative_collected)
-                cumulative_collected += collected
-                period_capped = collected == ch.trade.cash_cap
-                capped = True if period_capped else capped
-
-                period_type = PredictedFundedPeriod if predicted else FundedPeriod
-                periods.append(
-                    period_type(
-                        period=period_num,
-                        month=payment_period_month,
-                        payment=payment_sum,
-                        cumulative_payment=cumulative_payment,
-                        threshold_payment_percentage=threshold_payment_percentage,
-                        threshold_expected_payment=threshold_expected_payment,
-                        threshold_failed=threshold_failed,
-                        share_applied=share_applied,
-                        collected=collected,
-                        cumulative_collected=cumulative_collected,
-                        capped=period_capped,
-                    )
-                )
-                if _is_predicted_period(period_num, payments_by_month, churn) and capped:
-                    break
+        latest_period_month = payment_period_month
 
+        if ch.trade:
+            threshold_payment_share = thresholds_by_period_num.get(period_num, None)
+            if not predicted:
+                threshold_failed = bool(failed_vec[period_num])
+                share_applied = float(share_vec[period_num])
+                collected = float(collected_vec[period_num])
+                cumulative_collected = float(cum_collected_vec[period_num])
             else:
-                periods.append(
-                    Period(
-                        period=period_num,
-                        month=payment_period_month,
-                        payment=payment_sum,
-                        cumulative_payment=cumulative_payment,
-                    )
+                threshold_failed, share_applied = _effective_share_for_period(
+                    payment_sum, spend, base_share, threshold_payment_share
                 )
+                collected = min(share_applied * payment_sum, cash_cap - cumulative_collected)
+                cumulative_collected += collected
+            threshold_payment_percentage = threshold_payment_share*100 if threshold_payment_share is not None else None
+            threshold_expected_payment = threshold_payment_share * spend if threshold_payment_share else None
+            period_capped = cumulative_collected >= cash_cap
+            capped = True if period_capped else capped
 
-        if ch.trade:
-            annual_irr = _calculate_funded_cohort_irr(ch.spend.spend, periods)
-            cohorts.append(
-                FundedCohort(
-                    cohort_month=cohort_month,
-                    company_id=company_id,
-                    spend=ch.spend.spend,
-                    periods=periods,
-                    customers=customers,
+            period_type = PredictedFundedPeriod if predicted else FundedPeriod
+            periods.append(
+                period_type(
+                    period=period_num,
+                    month=payment_period_month,
+                    payment=payment_sum,
                     cumulative_payment=cumulative_payment,
-                    trade_id=ch.trade.id,
-                    sharing_percentage=ch.trade.sharing_percentage,
-                    cash_cap=ch.trade.cash_cap,
+                    threshold_payment_percentage=threshold_payment_percentage,
+                    threshold_expected_payment=threshold_expected_payment,
+                    threshold_failed=threshold_failed,
+                    share_applied=share_applied,
+                    collected=collected,
                     cumulative_collected=cumulative_collected,
-                    capped=capped,
-                    annual_irr=annual_irr
+                    capped=period_capped,
                 )
             )
+            if predicted and capped:
+                break
+
         else:
-            cohorts.append(
-                Cohort(
-                    cohort_month=cohort_month,
-                    company_id=company_id,
-                    spend=ch.spend.spend,
-                    periods=periods,
-                    customers=customers,
+            periods.append(
+                Period(
+                    period=period_num,
+                    month=payment_period_month,
+                    payment=payment_sum,
                     cumulative_payment=cumulative_payment,
                 )
             )
 
+    if ch.trade:
+        annual_irr = _calculate_funded_cohort_irr(ch.spend.spend, periods)
+        return FundedCohort(
+            cohort_month=cohort_month,
+            company_id=company_id,
+            spend=ch.spend.spend,
+            periods=periods,
+            customers=customers,
+            cumulative_payment=cumulative_payment,
+            trade_id=ch.trade.id,
+            sharing_percentage=ch.trade.sharing_percentage,
+            cash_cap=ch.trade.cash_cap,
+            cumulative_collected=cumulative_collected,
+            capped=capped,
+            annual_irr=annual_irr
+        )
+    else:
+        return Cohort(
+            cohort_month=cohort_month,
+            company_id=company_id,
+            spend=ch.spend.spend,
+            periods=periods,
+            customers=customers,
+            cumulative_payment=cumulative_payment,
+        )
+
+def compute_company_cohort_cashflows(
+    company_id: str, trades: List[Trade], payments: List[Payment], spends: List[Spend], thresholds: List[Threshold], churn: Optional[float] = None
+) -> List[FundedCohort | Cohort]:
+
+    consolidated = {s.cohort_month: _ConsolidatedCohort(spend=s) for s in spends}
+    for tr in trades:
+        consolidated[tr.cohort_month].trade = tr
+    for p in payments:
+        consolidated[p.cohort_month].payments.append(p)
+
+    # Company-level constants: identical for every cohort, so build them once.
+    # Coercing the Numeric column to float here means the per-period lookups
+    # hand back plain floats with no Decimal conversion in the hot loop.
+    thresholds_by_period_num = {th.payment_period_month: float(th.minimum_payment_percent) for th in thresholds}
+
+    if len(consolidated) >= PARALLEL_COHORT_MIN:
+        with ThreadPoolExecutor() as executor:
+            cohorts = list(
+                executor.map(
+                    lambda item: _compute_cohort(company_id, item[0], item[1], thresholds_by_period_num, churn),
+                    consolidated.items(),
+                )
+            )
+    else:
+        cohorts = [
+            _compute_cohort(company_id, cohort_month, ch, thresholds_by_period_num, churn)
+            for cohort_month, ch in consolidated.items()
+        ]
+
     cohorts.sort(key=lambda x: x.cohort_month)
     return cohorts
+
+
+def payment_df_to_cohort_df(payment_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate a raw payments table into a (cohort month x period) matrix.
+
+    A customer's cohort is the calendar month of their first payment; period N
+    holds the amounts they paid N months later. The whole transformation is a
+    single vectorized pass — month truncation, a groupby-transform for the
+    cohort assignment, and one groupby/unstack for the pivot — with no
+    per-customer Python loop.
+    """
+    if payment_df.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([]), dtype=np.float64)
+
+    dates = payment_df["payment_date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="mixed")
+
+    # datetime64[M] truncates to month starts, and subtracting two of them
+    # yields the period offset directly as whole months.
+    payment_month = dates.to_numpy().astype("datetime64[M]")
+    cohort = (
+        pd.Series(payment_month, index=payment_df.index)
+        .groupby(payment_df["customer_id"], sort=False)
+        .transform("min")
+        .to_numpy()
+        .astype("datetime64[M]")
+    )
+    period = (payment_month - cohort).astype(np.int64)
+
+    amounts = payment_df["amount"].to_numpy(dtype=np.float64)
+    # NaN amounts contribute nothing, matching groupby-sum's skipna behaviour
+    valid = ~np.isnan(amounts)
+    if not valid.all():
+        cohort, period, amounts = cohort[valid], period[valid], amounts[valid]
+
+    # Scatter-add into a preallocated dense matrix replaces the hash
+    # groupby/unstack pivot: factorize the cohort axis once, then a single
+    # np.add.at pass accumulates every payment with no per-group overhead.
+    # The endpoints hit this shape repeatedly, so staying inside ufunc
+    # machinery amortizes far better than rebuilding groupby hash tables.
+    row_codes, row_months = pd.factorize(cohort, sort=True)
+    out = np.zeros((len(row_months), int(period.max()) + 1), dtype=np.float64)
+    np.add.at(out, (row_codes, period), amounts)
+
+    return pd.DataFrame(
+        out,
+        index=pd.DatetimeIndex(np.asarray(row_months).astype("datetime64[ns]")),
+        columns=pd.RangeIndex(out.shape[1]),
+    )
+
+
+@lru_cache(maxsize=8)
+def _spend_series_for(cohorts: tuple, spends: tuple) -> pd.Series:
+    """Build the cohort-indexed spend Series once per distinct spend table.
+
+    The prediction, threshold, and cashflow passes all consume the same
+    spend_df; memoizing on the (hashable) column contents means the date
+    parse and index hash table are paid once per table, not per call.
+    """
+    return pd.Series(spends, index=pd.to_datetime(list(cohorts)), dtype=np.float64)
+
+
+def _spend_lookup(spend_df: pd.DataFrame) -> pd.Series:
+    if "spend" not in spend_df.columns:
+        return pd.Series(dtype=np.float64)
+    return _spend_series_for(tuple(map(str, spend_df["cohort"])), tuple(map(float, spend_df["spend"])))
+
+
+def apply_predictions_to_cohort_df(
+    predictions_dict: Dict[str, Dict],
+    spend_df: pd.DataFrame,
+    cohort_df: pd.DataFrame,
+    horizon_months: int,
+    scenario: Optional[str] = None,
+) -> pd.DataFrame:
+    """Extend a cohort matrix out to ``horizon_months`` periods of predictions.
+
+    Predictions arrive either as a dict keyed by ISO month string (optionally
+    filtered by ``scenario``) or pre-flattened as an (index, m0, churn) array
+    tuple. Actual values are preserved. A cohort with parameters gets a missing
+    period 0 seeded as ``m0 * spend`` and later periods decayed geometrically
+    from its last actual period; cohorts without parameters get zeros. The
+    decay is a single NumPy broadcast across all cohorts rather than a
+    per-cohort, per-month loop.
+    """
+    out = cohort_df.reindex(columns=range(horizon_months))
+    if out.empty:
+        return out.fillna(0.0)
+
+    n = len(out)
+    m0 = np.full(n, np.nan)
+    churn = np.full(n, np.nan)
+    if isinstance(predictions_dict, tuple):
+        # Structure-of-arrays form: (index, m0, churn) aligned arrays, no
+        # per-cohort dict walk. Scenario labels exist only in the dict form.
+        pred_index, m0_arr, churn_arr = predictions_dict
+        pos = pred_index.get_indexer(out.index)
+        found = pos >= 0
+        m0[found] = np.asarray(m0_arr, dtype=np.float64)[pos[found]]
+        churn[found] = np.asarray(churn_arr, dtype=np.float64)[pos[found]]
+    else:
+        # One vectorized strftime for the whole index beats a per-row
+        # Timestamp.strftime round-trip when building the lookup keys.
+        for i, cohort_key in enumerate(out.index.strftime("%Y-%m-%d")):
+            params = predictions_dict.get(cohort_key)
+            if params is None:
+                continue
+            if scenario is not None and params.get("scenario") != scenario:
+                continue
+            m0[i] = params.get("m0", np.nan)
+            churn[i] = params.get("churn", np.nan)
+
+    # Under copy-on-write the reindex above shares the actual columns with
+    # cohort_df; only the columns written below allocate new buffers, so the
+    # actuals region is never duplicated.
+    actual_cols = set(cohort_df.columns)
+    last_actual = max(actual_cols) if actual_cols else -1
+    first_pred = last_actual + 1
+
+    if 0 not in actual_cols and horizon_months > 0:
+        spend = _spend_lookup(spend_df).reindex(out.index).to_numpy(dtype=np.float64)
+        out.iloc[:, 0] = np.nan_to_num(m0 * spend)
+
+    if first_pred < horizon_months:
+        # seed * (1-churn)^k for every (cohort, future period) at once
+        k = np.arange(1, horizon_months - last_actual)
+        decay = (1.0 - np.nan_to_num(churn)[:, None]) ** k[None, :]
+        seed = out.iloc[:, last_actual].to_numpy(dtype=np.float64) if last_actual >= 0 else np.zeros(n)
+        predicted = seed[:, None] * decay
+        predicted[np.isnan(churn)] = 0.0
+        out.iloc[:, first_pred:] = predicted
+
+    gap_cols = [c for c in range(1, min(first_pred, horizon_months)) if c not in actual_cols]
+    if gap_cols:
+        out.loc[:, gap_cols] = 0.0
+    return out
+
+
+class _ThresholdMatrix(pd.DataFrame):
+    """Boolean threshold-failure matrix. A plain DataFrame except that, being
+    uniformly bool, it exposes the single ``dtype`` of the ndarray it wraps."""
+
+    @property
+    def _constructor(self):
+        return _ThresholdMatrix
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(bool)
+
+
+def apply_threshold_to_cohort_df(
+    cohort_df: pd.DataFrame, spend_df: pd.DataFrame, thresholds: List[Dict]
+) -> pd.DataFrame:
+    """Flag every (cohort, period) cell whose payment-to-spend ratio misses the
+    period's minimum threshold. One broadcasted ndarray comparison covers the
+    whole matrix; periods without a threshold never fail, and zero or missing
+    spend produces inf/nan ratios that compare False rather than raising.
+    """
+    if not thresholds:
+        return _ThresholdMatrix(False, index=cohort_df.index, columns=cohort_df.columns)
+
+    spend = _spend_lookup(spend_df).reindex(cohort_df.index).to_numpy(dtype=np.float64)
+    minimums = np.full(cohort_df.shape[1], np.nan)
+    column_pos = {label: pos for pos, label in enumerate(cohort_df.columns)}
+    for threshold in thresholds:
+        pos = column_pos.get(threshold["payment_period_month"])
+        if pos is not None:
+            minimums[pos] = threshold["minimum_payment_percent"]
+
+    # A masked ufunc call compares every thresholded cell in one pass; cells
+    # under a NaN sentinel keep the preinitialized False without the two
+    # fancy-indexed temporaries a boolean-mask assignment would build.
+    fails = np.zeros(cohort_df.shape, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = cohort_df.to_numpy(dtype=np.float64) / spend[:, None]
+        np.less(ratios, minimums[None, :], where=~np.isnan(minimums)[None, :], out=fails)
+    return _ThresholdMatrix(fails, index=cohort_df.index, columns=cohort_df.columns)
+
+
+def get_cvf_cashflows_df(
+    predicted_cohort_df: pd.DataFrame, spend_df: pd.DataFrame, thresholds: List[Dict], trades: List[Dict]
+) -> pd.DataFrame:
+    """Compute CVF collections per (traded cohort, period).
+
+    Trades are unpacked into parallel share/cap arrays (summed for repeat
+    cohorts), each cell collects ``payment * share`` — at 100% where the
+    period failed its threshold — and the running total per cohort is clamped
+    to the cash cap with one cumsum/minimum/diff pass instead of a stateful
+    per-period loop. Traded cohorts absent from the matrix get zero rows.
+    """
+    if not trades:
+        return pd.DataFrame(index=pd.DatetimeIndex([]), columns=predicted_cohort_df.columns, dtype=np.float64)
+
+    cohorts = np.array([t["cohort_start_at"] for t in trades], dtype="datetime64[ns]")
+    terms = pd.DataFrame(
+        {
+            "share": np.array([t["sharing_percentage"] for t in trades], dtype=np.float64),
+            "cap": np.array([t["cash_cap"] for t in trades], dtype=np.float64),
+        }
+    ).groupby(cohorts, sort=True).sum()
+
+    index = pd.DatetimeIndex(terms.index)
+    payments = predicted_cohort_df.reindex(index, fill_value=0.0)
+    failed = apply_threshold_to_cohort_df(payments, spend_df, thresholds).to_numpy()
+
+    effective_share = np.where(failed, 1.0, terms["share"].to_numpy()[:, None])
+    raw = payments.to_numpy(dtype=np.float64) * effective_share
+    capped_cumulative = np.minimum(np.cumsum(raw, axis=1), terms["cap"].to_numpy()[:, None])
+    collections = np.diff(capped_cumulative, axis=1, prepend=0.0)
+    return pd.DataFrame(collections, index=index, columns=payments.columns)
+
+
+def calculate_ltv_cac_metrics(cohort_df: pd.DataFrame, spend_df: pd.DataFrame) -> Dict[str, float]:
+    """Summarize portfolio economics from a cohort matrix and spend table.
+
+    ``total_payments`` sums the whole matrix; the moic/ltv numerator is
+    collected-to-date, which excludes payments landing in the portfolio's
+    entry month (the first cohort's period 0 arrives in the same month its
+    spend is deployed). Everything reduces through flat ndarray sums with
+    explicit guards so empty inputs and zero spend yield zeros rather than
+    NaN or a division error.
+    """
+    total_spend = (
+        float(np.nansum(spend_df["spend"].to_numpy(dtype=np.float64)))
+        if "spend" in spend_df.columns and len(spend_df)
+        else 0.0
+    )
+    if cohort_df.empty:
+        return {
+            "ltv_estimate": 0.0,
+            "cac_estimate": 0.0,
+            "moic_to_date": 0.0,
+            "total_payments": 0.0,
+            "total_spend": total_spend,
+        }
+
+    arr = cohort_df.to_numpy(dtype=np.float64)
+    total_payments = float(arr.sum())
+
+    # Cell (cohort, period) lands in calendar month cohort + period; the mask
+    # picks out the cells that fall in the earliest cohort's own month.
+    cohort_ord = cohort_df.index.to_numpy().astype("datetime64[M]").astype(np.int64)
+    period_ord = np.asarray(cohort_df.columns, dtype=np.int64)
+    entry_month = (cohort_ord - cohort_ord.min())[:, None] + period_ord[None, :] == 0
+    collected_to_date = total_payments - float(arr[entry_month].sum())
+
+    num_cohorts = len(cohort_df)
+    return {
+        "ltv_estimate": collected_to_date / num_cohorts,
+        "cac_estimate": total_spend / num_cohorts,
+        "moic_to_date": collected_to_date / total_spend if total_spend else 0.0,
+        "total_payments": total_payments,
+        "total_spend": total_spend,
+    }
+
+
+def calculate_current_month_owed(cashflows_df: pd.DataFrame, as_of_month: date) -> float:
+    """Sum the collections owed across all cohorts for the period containing
+    ``as_of_month``. The period offset is computed once from the earliest
+    cohort month and clipped to the matrix, so the lookup is a single
+    positional column reduction."""
+    if cashflows_df.empty or cashflows_df.shape[1] == 0:
+        return 0.0
+
+    first_cohort = cashflows_df.index.min()
+    offset = (as_of_month.year - first_cohort.year) * 12 + (as_of_month.month - first_cohort.month)
+    offset = min(max(offset, 0), cashflows_df.shape[1] - 1)
+    return float(cashflows_df.iloc[:, offset].to_numpy(dtype=np.float64).sum())
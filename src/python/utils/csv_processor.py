@@ -9,8 +9,6 @@ import structlog
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from src.python.db.schemas import Payment
-
 logger = structlog.get_logger(__file__)
 
 
@@ -102,8 +100,8 @@ class CSVProcessor:
         self.logger.info("Data type validation completed", column_types=column_types)
         return validated_df
 
-    def process_payments_csv(self, company_id: int, df: pd.DataFrame, db: Session) -> List[Payment]:
-        """Process payments CSV and create Payment objects"""
+    def process_payments_csv(self, company_id: int, df: pd.DataFrame, db: Session) -> List[Dict[str, Any]]:
+        """Process payments CSV and bulk insert payment rows"""
         self.logger.info("Processing payments CSV", company_id=company_id, row_count=len(df))
 
         from src.python.db.db_operations import DatabaseOperations
@@ -115,29 +113,32 @@ class CSVProcessor:
             self.logger.error("Company not found", company_id=company_id)
             raise HTTPException(status_code=404, detail="Company not found")
 
-        payments_created = []
+        # One grouped query up front instead of a per-row customer lookup
+        first_payment_dates = db_ops.payments.get_first_payment_dates(company_id)
+
+        payment_rows = []
         errors = []
 
         for index, row in df.iterrows():
             try:
                 # Calculate cohort month (first payment month for customer)
-                existing_payments = db_ops.payments.get_customer_payments(company_id, str(row["customer_id"]))
+                first_payment_date = first_payment_dates.get(str(row["customer_id"]))
 
-                if existing_payments:
-                    cohort_month = min(p.payment_date for p in existing_payments).replace(day=1)
+                if first_payment_date is not None:
+                    cohort_month = first_payment_date.replace(day=1)
                 else:
                     cohort_month = row["payment_date"].replace(day=1)
 
-                payment = db_ops.payments.create_payment(
-                    company_id=company_id,
-                    customer_id=str(row["customer_id"]),
-                    payment_date=row["payment_date"],
-                    cohort_month=cohort_month,
-                    amount=float(row["amount"]),
+                payment_rows.append(
+                    {
+                        "company_id": company_id,
+                        "customer_id": str(row["customer_id"]),
+                        "payment_date": row["payment_date"],
+                        "cohort_month": cohort_month,
+                        "amount": float(row["amount"]),
+                    }
                 )
 
-                payments_created.append(payment)
-
             except Exception as e:
                 error_msg = f"Row {index + 1}: {str(e)}"
                 errors.append(error_msg)
@@ -153,9 +154,12 @@ class CSVProcessor:
                 status_code=400, detail=f"Failed to process {len(errors)} rows. First error: {errors[0]}"
             )
 
-        self.logger.info("Payments processing completed", company_id=company_id, payments_created=len(payments_created))
+        # Single executemany insert instead of one ORM add per row
+        db_ops.payments.bulk_insert_payment_rows(payment_rows)
+
+        self.logger.info("Payments processing completed", company_id=company_id, payments_created=len(payment_rows))
 
-        return payments_created
+        return payment_rows
 
 
 class PaymentsCSVProcessor(CSVProcessor):